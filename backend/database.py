@@ -0,0 +1,130 @@
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import SecondaryPreferred
+import os
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# MongoDB requires maxStalenessSeconds >= 90, or -1 for no limit
+MIN_MAX_STALENESS_SECONDS = 90
+
+# MongoDB connection pool monitoring
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks open and checked-out connection ids per server in this process.
+
+    pymongo calls listeners from Motor's executor threads, so the sets are
+    updated under a lock. Connections still checked out when their pool
+    closes report back after PoolClosedEvent; those events are ignored so
+    they cannot leak into a pool recreated for the same server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    @staticmethod
+    def _key(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def _add(self, kind: str, event):
+        with self._lock:
+            pool = self._pools.get(self._key(event))
+            if pool is not None:
+                pool[kind].add(event.connection_id)
+
+    def _discard(self, kind: str, event):
+        with self._lock:
+            pool = self._pools.get(self._key(event))
+            if pool is not None:
+                pool[kind].discard(event.connection_id)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                address: {"open": len(pool["open"]), "checked_out": len(pool["checked_out"])}
+                for address, pool in self._pools.items()
+            }
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pools[self._key(event)] = {"open": set(), "checked_out": set()}
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(self._key(event), None)
+
+    def connection_created(self, event):
+        self._add("open", event)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._discard("open", event)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        self._add("checked_out", event)
+
+    def connection_checked_in(self, event):
+        self._discard("checked_out", event)
+
+def mongo_client_options(environ=os.environ) -> dict:
+    options = {
+        'maxPoolSize': int(environ.get('MONGO_MAX_POOL_SIZE', 100)),
+        'minPoolSize': int(environ.get('MONGO_MIN_POOL_SIZE', 0)),
+        'connectTimeoutMS': int(environ.get('MONGO_CONNECT_TIMEOUT_MS', 20000)),
+        'serverSelectionTimeoutMS': int(environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000)),
+    }
+    compressors = environ.get('MONGO_COMPRESSORS', 'zstd,zlib')
+    if compressors:
+        options['compressors'] = compressors
+    if environ.get('MONGO_MAX_IDLE_TIME_MS'):
+        options['maxIdleTimeMS'] = int(environ['MONGO_MAX_IDLE_TIME_MS'])
+    if environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS'):
+        options['waitQueueTimeoutMS'] = int(environ['MONGO_WAIT_QUEUE_TIMEOUT_MS'])
+    return options
+
+def history_max_staleness(environ=os.environ) -> int:
+    staleness = int(environ.get('MONGO_HISTORY_MAX_STALENESS_SECONDS', MIN_MAX_STALENESS_SECONDS))
+    if staleness != -1 and staleness < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(
+            f"MONGO_HISTORY_MAX_STALENESS_SECONDS must be -1 or at least "
+            f"{MIN_MAX_STALENESS_SECONDS}, got {staleness}"
+        )
+    return staleness
+
+# MongoDB Config
+mongo_options = mongo_client_options()
+MONGO_MAX_POOL_SIZE = mongo_options['maxPoolSize']
+MONGO_MIN_POOL_SIZE = mongo_options['minPoolSize']
+MONGO_HISTORY_MAX_STALENESS_SECONDS = history_max_staleness()
+
+# MongoDB connection
+mongo_url = os.environ['MONGO_URL']
+pool_stats = PoolStatsListener()
+client = AsyncIOMotorClient(mongo_url, event_listeners=[pool_stats], **mongo_options)
+db = client[os.environ['DB_NAME']]
+# Auth, writes and single-document lookups use `db` (primary). The history
+# listing may read from a secondary lagging by up to the staleness bound,
+# falling back to the primary on a single node.
+history_contents = db.get_collection(
+    'contents',
+    read_preference=SecondaryPreferred(max_staleness=MONGO_HISTORY_MAX_STALENESS_SECONDS)
+)
@@ -1,8 +1,7 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
@@ -16,15 +15,12 @@ from emergentintegrations.llm.chat import LlmChat, UserMessage
 from emergentintegrations.llm.openai.image_generation import OpenAIImageGeneration
 import base64
 import asyncio
+import hmac
+from database import client, db, history_contents, pool_stats, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # JWT Config
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
 JWT_ALGORITHM = "HS256"
@@ -33,6 +29,9 @@ JWT_EXPIRATION_HOURS = 24
 # LLM Config
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 
+# Monitoring Config
+MONITORING_TOKEN = os.environ.get('MONITORING_TOKEN')
+
 # Create the main app
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
@@ -121,7 +120,7 @@ async def signup(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    password_hash = hash_password(user_data.password)
+    password_hash = await asyncio.to_thread(hash_password, user_data.password)
     user = User(
         email=user_data.email,
         password_hash=password_hash,
@@ -151,7 +150,7 @@ async def login(login_data: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not verify_password(login_data.password, user['password_hash']):
+    if not await asyncio.to_thread(verify_password, login_data.password, user['password_hash']):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Create token
@@ -251,7 +250,7 @@ async def generate_image(request: ImageGenerationRequest, current_user: dict = D
             raise HTTPException(status_code=500, detail="No image was generated")
         
         # Convert to base64
-        image_base64 = base64.b64encode(images[0]).decode('utf-8')
+        image_base64 = await asyncio.to_thread(lambda: base64.b64encode(images[0]).decode('utf-8'))
         
         # Save to database
         content = Content(
@@ -284,7 +283,7 @@ async def get_contents(current_user: dict = Depends(get_current_user), content_t
     if content_type:
         query["content_type"] = content_type
     
-    contents = await db.contents.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
+    contents = await history_contents.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
     
     for content in contents:
         if isinstance(content['created_at'], str):
@@ -318,6 +317,32 @@ async def delete_content(content_id: str, current_user: dict = Depends(get_curre
 async def health():
     return {"status": "ok"}
 
+@api_router.get("/health/db")
+async def health_db(x_monitoring_token: Optional[str] = Header(None)):
+    # Internal only: hidden unless MONITORING_TOKEN is set, and it exposes MongoDB hosts
+    if not MONITORING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Compare bytes: compare_digest rejects non-ASCII str, and Starlette decodes headers as latin-1
+    if not x_monitoring_token or not hmac.compare_digest(x_monitoring_token.encode(), MONITORING_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid monitoring token")
+    
+    # Each uvicorn worker has its own client and pool, so these numbers cover
+    # only the worker that answered; aggregate across pids for the deployment.
+    servers = {
+        address: {
+            **counts,
+            "utilization": counts["checked_out"] / MONGO_MAX_POOL_SIZE if MONGO_MAX_POOL_SIZE else 0,
+        }
+        for address, counts in pool_stats.snapshot().items()
+    }
+    return {
+        "scope": "worker",
+        "pid": os.getpid(),
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+        "servers": servers,
+    }
+
 # Include router
 app.include_router(api_router)
 
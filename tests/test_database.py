@@ -0,0 +1,128 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("motor")
+from pymongo import ReadPreference, monitoring
+from pymongo.read_preferences import SecondaryPreferred
+
+# The client connects lazily, so no server is needed to inspect its settings
+os.environ.setdefault("MONGO_URL", os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017"))
+os.environ.setdefault("DB_NAME", "contentai_test")
+
+import database  # noqa: E402
+
+ADDRESS = ("db.internal", 27017)
+
+
+def test_client_options_default():
+    assert database.mongo_client_options({}) == {
+        "maxPoolSize": 100,
+        "minPoolSize": 0,
+        "connectTimeoutMS": 20000,
+        "serverSelectionTimeoutMS": 30000,
+        "compressors": "zstd,zlib",
+    }
+
+
+def test_client_options_from_env():
+    options = database.mongo_client_options({
+        "MONGO_MAX_POOL_SIZE": "25",
+        "MONGO_MIN_POOL_SIZE": "5",
+        "MONGO_CONNECT_TIMEOUT_MS": "1000",
+        "MONGO_SERVER_SELECTION_TIMEOUT_MS": "2000",
+        "MONGO_COMPRESSORS": "snappy",
+        "MONGO_MAX_IDLE_TIME_MS": "60000",
+        "MONGO_WAIT_QUEUE_TIMEOUT_MS": "500",
+    })
+    assert options == {
+        "maxPoolSize": 25,
+        "minPoolSize": 5,
+        "connectTimeoutMS": 1000,
+        "serverSelectionTimeoutMS": 2000,
+        "compressors": "snappy",
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": 500,
+    }
+
+
+def test_empty_compressors_disable_compression():
+    assert "compressors" not in database.mongo_client_options({"MONGO_COMPRESSORS": ""})
+
+
+@pytest.mark.parametrize("value, expected", [("90", 90), ("300", 300), ("-1", -1)])
+def test_history_max_staleness_accepts_valid_values(value, expected):
+    assert database.history_max_staleness({"MONGO_HISTORY_MAX_STALENESS_SECONDS": value}) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "30", "89", "-5"])
+def test_history_max_staleness_rejects_values_below_minimum(value):
+    with pytest.raises(ValueError, match="MONGO_HISTORY_MAX_STALENESS_SECONDS"):
+        database.history_max_staleness({"MONGO_HISTORY_MAX_STALENESS_SECONDS": value})
+
+
+def test_client_uses_configured_options():
+    options = database.client.delegate.options.pool_options
+    assert options.max_pool_size == database.MONGO_MAX_POOL_SIZE
+    assert options.min_pool_size == database.MONGO_MIN_POOL_SIZE
+
+
+def test_history_reads_prefer_secondaries_with_bounded_staleness():
+    read_preference = database.history_contents.read_preference
+    assert isinstance(read_preference, SecondaryPreferred)
+    assert read_preference.max_staleness == database.MONGO_HISTORY_MAX_STALENESS_SECONDS
+
+
+def test_auth_and_writes_stay_on_primary():
+    assert database.db.users.read_preference == ReadPreference.PRIMARY
+    assert database.db.contents.read_preference == ReadPreference.PRIMARY
+
+
+def test_listener_counts_check_outs_and_check_ins():
+    listener = database.PoolStatsListener()
+    listener.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {}))
+    for connection_id in (1, 2):
+        listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, connection_id))
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, connection_id))
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+
+    assert listener.snapshot() == {"db.internal:27017": {"open": 2, "checked_out": 1}}
+
+    listener.pool_closed(monitoring.PoolClosedEvent(ADDRESS))
+    assert listener.snapshot() == {}
+
+
+def test_listener_ignores_connections_returned_after_pool_closed():
+    listener = database.PoolStatsListener()
+    listener.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {}))
+    listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1))
+    listener.pool_closed(monitoring.PoolClosedEvent(ADDRESS))
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    listener.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "poolClosed"))
+
+    assert listener.snapshot() == {}
+
+    listener.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {}))
+    assert listener.snapshot() == {"db.internal:27017": {"open": 0, "checked_out": 0}}
+
+
+def test_listener_counts_are_exact_under_concurrency():
+    listener = database.PoolStatsListener()
+    listener.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {}))
+
+    def churn(thread_index):
+        connection_ids = range(thread_index * 10000, (thread_index + 1) * 10000)
+        for connection_id in connection_ids:
+            listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, connection_id))
+        for connection_id in connection_ids[1:]:
+            listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, connection_id))
+
+    threads = [threading.Thread(target=churn, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert listener.snapshot()["db.internal:27017"]["checked_out"] == 8
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+from fastapi.testclient import TestClient
+
+# The client connects lazily, so no server is needed for these endpoints
+os.environ.setdefault("MONGO_URL", os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017"))
+os.environ.setdefault("DB_NAME", "contentai_test")
+
+import server  # noqa: E402
+
+client = TestClient(server.app)
+
+
+def test_health_db_is_hidden_without_monitoring_token(monkeypatch):
+    monkeypatch.setattr(server, "MONITORING_TOKEN", None)
+    response = client.get("/api/health/db", headers={"X-Monitoring-Token": "anything"})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"X-Monitoring-Token": "wrong"},
+    {"X-Monitoring-Token": "é".encode("latin-1")},
+])
+def test_health_db_rejects_missing_or_wrong_token(monkeypatch, headers):
+    monkeypatch.setattr(server, "MONITORING_TOKEN", "s3cret")
+    response = client.get("/api/health/db", headers=headers)
+    assert response.status_code == 401
+
+
+def test_health_db_reports_this_workers_pool(monkeypatch):
+    monkeypatch.setattr(server, "MONITORING_TOKEN", "s3cret")
+    response = client.get("/api/health/db", headers={"X-Monitoring-Token": "s3cret"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["scope"] == "worker"
+    assert body["pid"] == os.getpid()
+    assert body["max_pool_size"] == server.MONGO_MAX_POOL_SIZE
+    assert body["min_pool_size"] == server.MONGO_MIN_POOL_SIZE
+    assert isinstance(body["servers"], dict)
@@ -0,0 +1,99 @@
+"""Runs the backend with several uvicorn workers against a local mongod.
+
+Set TEST_MONGO_URL (e.g. mongodb://localhost:27017) to enable these tests.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+httpx = pytest.importorskip("httpx")
+pymongo = pytest.importorskip("pymongo")
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL")
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+WORKERS = 2
+
+pytestmark = pytest.mark.skipif(not TEST_MONGO_URL, reason="TEST_MONGO_URL is not set")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def worker_pids(parent_pid: int) -> list:
+    children = Path(f"/proc/{parent_pid}/task/{parent_pid}/children").read_text().split()
+    pids = []
+    for pid in children:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ")
+        if b"spawn_main" in cmdline:
+            pids.append(int(pid))
+    return pids
+
+
+@pytest.fixture
+def server():
+    db_name = f"contentai_test_{uuid.uuid4().hex[:8]}"
+    port = free_port()
+    env = {
+        **os.environ,
+        "MONGO_URL": TEST_MONGO_URL,
+        "DB_NAME": db_name,
+        "JWT_SECRET": "test-secret",
+        "WEB_CONCURRENCY": str(WORKERS),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}/api"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                pytest.fail("server did not start")
+            time.sleep(0.2)
+        yield proc, base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+        pymongo.MongoClient(TEST_MONGO_URL).drop_database(db_name)
+
+
+def test_starts_worker_processes_from_web_concurrency(server):
+    proc, _ = server
+    assert len(worker_pids(proc.pid)) == WORKERS
+
+
+def test_auth_state_is_shared_across_workers(server):
+    _, base_url = server
+    credentials = {"email": f"{uuid.uuid4().hex[:8]}@example.com", "password": "secret123"}
+    response = httpx.post(f"{base_url}/auth/signup", json={**credentials, "name": "Worker Test"}, timeout=30)
+    assert response.status_code == 200
+
+    def login_and_fetch_me(_):
+        # A fresh connection per call lets the kernel hand it to any worker
+        login = httpx.post(f"{base_url}/auth/login", json=credentials, timeout=30)
+        token = login.json()["access_token"]
+        me = httpx.get(f"{base_url}/auth/me", headers={"Authorization": f"Bearer {token}"}, timeout=30)
+        return login.status_code, me.status_code
+
+    with ThreadPoolExecutor(max_workers=WORKERS * 4) as pool:
+        results = list(pool.map(login_and_fetch_me, range(WORKERS * 8)))
+
+    assert results == [(200, 200)] * len(results)